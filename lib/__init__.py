@@ -5,7 +5,6 @@ for the Novation Launch Control XL 3.
 """
 
 from .sysex_generator import SysExTemplateGenerator, ChannelMode, CCMode
-from .led_mapper import LEDColorMapper
 from .constants import (
     COLOR_MAP, COLOR_NAMES, COLOR_ABBREV, CONTROLS, DEVICE_LAYOUT,
     MAX_CC_VALUE, MIN_CC_VALUE, DEFAULT_MIN_CC_VALUE, MAX_MIDI_CHANNEL, MIN_MIDI_CHANNEL,
@@ -13,6 +12,16 @@ from .constants import (
 )
 
 __version__ = "1.0.0"
+
+
+def __getattr__(name):
+    # The LED mapper pulls in curses, so it is only imported on first use
+    if name == "LEDColorMapper":
+        from .led_mapper import LEDColorMapper
+        return LEDColorMapper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "SysExTemplateGenerator", "LEDColorMapper", "ChannelMode", "CCMode",
     "COLOR_MAP", "COLOR_NAMES", "COLOR_ABBREV", "CONTROLS", "DEVICE_LAYOUT",
@@ -98,8 +98,10 @@ def main():
     args = parser.parse_args()
     
     # Configure logging
-    if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(levelname)s: %(message)s'
+    )
     
     # Handle LED color mapper
     if args.leds:
@@ -116,9 +118,11 @@ def main():
                     sys.exit(1)
                 
                 mapper = LEDColorMapper()
-                color_map = mapper.edit_template_file(template_path)
-                if color_map:
+                color_map, changed = mapper.edit_template_file(template_path)
+                if color_map and changed:
                     print(f"LED colors updated for {template_path.name}")
+                elif color_map:
+                    print(f"LED colors unchanged for {template_path.name}, file not modified")
                 else:
                     print("LED color editing cancelled.")
             except Exception as e:
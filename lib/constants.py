@@ -1,5 +1,6 @@
 """Constants and configuration data for Launch Control XL 3."""
 
+from array import array
 from typing import List, Tuple, Dict
 
 # MIDI and template constants
@@ -40,6 +41,18 @@ CONTROLS: List[Tuple[int, int, int, int, int]] = [
     (1,284,281,279,282), (1,295,292,290,293), (1,306,303,301,304)
 ]
 
+# All embedded messages concatenated back-to-back, as written to a template file
+BASE_FLAT: bytes = b"".join(EMBEDDED_MSGS)
+
+# Start offset of each embedded message within the concatenated template buffer
+MESSAGE_OFFSETS: List[int] = [0, len(EMBEDDED_MSGS[0])]
+
+# Absolute byte offsets into the concatenated buffer, one compact unsigned-short array per field.
+# Controls without a local channel flag are omitted from FLAG_OFFSETS.
+CC_OFFSETS: array = array('H', [MESSAGE_OFFSETS[mi] + cc_pos for (mi, cc_pos, _, _, _) in CONTROLS])
+CH_OFFSETS: array = array('H', [MESSAGE_OFFSETS[mi] + ch_pos for (mi, _, ch_pos, _, _) in CONTROLS])
+FLAG_OFFSETS: array = array('H', [MESSAGE_OFFSETS[mi] + flag_pos for (mi, _, _, _, flag_pos) in CONTROLS if flag_pos >= 0])
+
 # Named colors for LED mapping
 COLOR_MAP: Dict[str, int] = {
     'red': 0x05, 'orange': 0x09, 'yellow': 0x0d, 'lime': 0x11, 'green': 0x19,
@@ -3,7 +3,7 @@
 import curses
 import logging
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple
 
 from .constants import (
     COLOR_MAP, COLOR_NAMES, COLOR_ABBREV, CONTROLS, DEVICE_LAYOUT
@@ -11,6 +11,53 @@ from .constants import (
 
 logger = logging.getLogger(__name__)
 
+# Reverse of COLOR_MAP for decoding color bytes read from templates
+_COLOR_VALUE_TO_NAME: Dict[int, str] = {value: name for name, value in COLOR_MAP.items()}
+
+# Closest terminal color for each LED color (unlisted colors use white)
+_COLOR_TO_CURSES: Dict[str, int] = {
+    'red': curses.COLOR_RED,
+    'orange': curses.COLOR_YELLOW, 'yellow': curses.COLOR_YELLOW,
+    'lime': curses.COLOR_GREEN, 'green': curses.COLOR_GREEN,
+    'turquoise': curses.COLOR_CYAN, 'cyan': curses.COLOR_CYAN,
+    'light_blue': curses.COLOR_BLUE,  # Light blue -> blue
+    'blue': curses.COLOR_BLUE, 'dark_blue': curses.COLOR_BLUE,
+    'purple': curses.COLOR_MAGENTA, 'fuchsia': curses.COLOR_MAGENTA,
+    'pink': curses.COLOR_RED,  # Pink -> red (closest match)
+    'off': curses.COLOR_WHITE
+}
+
+
+def _cell_abbrev(color_name: str) -> str:
+    """Two-letter display abbreviation for a color name."""
+    return COLOR_ABBREV.get(color_name, color_name[:2].upper())
+
+
+# Pre-formatted cell text per color, without and with the cursor on the cell
+_CELL_NORMAL: Dict[str, str] = {name: f" {_cell_abbrev(name)} " for name in COLOR_NAMES}
+_CELL_CURSOR: Dict[str, str] = {name: f"[{_cell_abbrev(name)}]" for name in COLOR_NAMES}
+
+# Sliders show a bar instead of a color abbreviation
+_SLIDER_NORMAL = " ██ "
+_SLIDER_CURSOR = "[██]"
+
+# Editor rows as (row, screen line, is slider row)
+_ROW_LAYOUT: Tuple[Tuple[int, int, bool], ...] = (
+    (0, 2, False), (1, 3, False), (2, 4, False),
+    (3, 5, True),
+    (4, 6, False), (5, 7, False),
+)
+
+# Flat list of device layout positions in control index order
+_ALL_POSITIONS: Tuple[Tuple[int, int], ...] = tuple(
+    pos
+    for section_name in ['knobs_top', 'knobs_mid', 'knobs_bot', 'sliders', 'buttons_top', 'buttons_bot']
+    for pos in DEVICE_LAYOUT[section_name]
+)
+
+# Each control's map tuple paired with its (row, col) position
+_CONTROL_TABLE: List[Tuple[Tuple[int, int, int, int, int], Tuple[int, int]]] = list(zip(CONTROLS, _ALL_POSITIONS))
+
 
 class LEDColorMapper:
     """Interactive curses-based LED color mapper for Launch Control XL 3."""
@@ -20,6 +67,7 @@ class LEDColorMapper:
         self.cursor_row = 0
         self.cursor_col = 0
         self.current_color_idx = 0
+        self._drawn_cells = {}  # (row, col) -> (display, attr) as last drawn on screen
         
         # Initialize all controls to 'off'
         for section in DEVICE_LAYOUT.values():
@@ -37,103 +85,78 @@ class LEDColorMapper:
         return self.colors
     
     def edit_template_file(self, template_path: Path):
-        """Edit LED colors for a specific template file."""
+        """Edit LED colors for a specific template file. Returns (color map or None if cancelled, whether the file changed)."""
         try:
-            # Read the current template file
-            template_data = template_path.read_bytes()
-            
-            # Parse current colors from the template
-            self._extract_colors_from_sysex(template_data)
+            # Read the current template file and parse current colors from it
+            messages = self._extract_colors_from_sysex(template_path.read_bytes())
             
             # Run the interactive editor
             color_map = self.run_interactive_editor()
             
             if color_map:
-                # Apply colors to the template and save
-                self._apply_colors_to_sysex(template_data, template_path)
-                return color_map
-            return None
+                # Apply colors to the parsed template and save
+                changed = self._apply_colors_to_messages(messages, template_path)
+                return color_map, changed
+            return None, False
             
         except Exception as e:
             logger.error(f"Failed to edit template file {template_path}: {e}")
             raise
     
-    def _extract_colors_from_sysex(self, sysex_data: bytes):
-        """Extract current LED colors from SysEx data."""
+    def _extract_colors_from_sysex(self, sysex_data: bytes) -> List[bytearray]:
+        """Extract current LED colors from SysEx data and return the parsed messages."""
         # Convert to bytearray for easier manipulation
         messages = self._split_sysex_messages(sysex_data)
         
         # Extract colors from each control
-        for control_index, (msg_index, _cc_pos, _ch_pos, color_pos, _flag_pos) in enumerate(CONTROLS):
+        for (msg_index, _cc_pos, _ch_pos, color_pos, _flag_pos), position in _CONTROL_TABLE:
             if msg_index < len(messages) and color_pos < len(messages[msg_index]):
                 color_value = messages[msg_index][color_pos]
                 
-                # Find color name from value
-                color_name = 'off'  # default
-                for name, value in COLOR_MAP.items():
-                    if value == color_value:
-                        color_name = name
-                        break
-                
-                # Map control to device layout position
-                row, col = self._control_index_to_position(control_index)
-                if row is not None and col is not None:
-                    self.colors[(row, col)] = color_name
+                # Find color name from value, defaulting to 'off'
+                self.colors[position] = _COLOR_VALUE_TO_NAME.get(color_value, 'off')
+        
+        return messages
     
     def _split_sysex_messages(self, sysex_data: bytes) -> List[bytearray]:
         """Split concatenated SysEx data into individual messages."""
         messages = []
-        start = 0
         
-        while start < len(sysex_data):
-            # Find next F0 (SysEx start)
-            if sysex_data[start] != 0xF0:
-                start += 1
-                continue
-            
-            # Find corresponding F7 (SysEx end)
-            end = start + 1
-            while end < len(sysex_data) and sysex_data[end] != 0xF7:
-                end += 1
-            
-            if end < len(sysex_data):
-                # Include the F7 byte
-                messages.append(bytearray(sysex_data[start:end + 1]))
-                start = end + 1
-            else:
-                break
+        # Every F7 (SysEx end) closes a message; the last part has no F7 and is incomplete
+        for part in sysex_data.split(b'\xf7')[:-1]:
+            # Skip anything before the F0 (SysEx start)
+            start = part.find(b'\xf0')
+            if start >= 0:
+                message = bytearray(part[start:])
+                message.append(0xF7)
+                messages.append(message)
         
         return messages
     
-    def _control_index_to_position(self, control_index: int) -> Tuple[Optional[int], Optional[int]]:
-        """Convert control index to (row, col) position in device layout."""
-        # Create flat list of all positions in order
-        all_positions = []
-        for section_name in ['knobs_top', 'knobs_mid', 'knobs_bot', 'sliders', 'buttons_top', 'buttons_bot']:
-            all_positions.extend(DEVICE_LAYOUT[section_name])
-        
-        if 0 <= control_index < len(all_positions):
-            return all_positions[control_index]
-        return None, None
-    
-    def _apply_colors_to_sysex(self, original_data: bytes, output_path: Path):
-        """Apply current color mapping to SysEx data and save to file."""
-        messages = self._split_sysex_messages(original_data)
+    def _apply_colors_to_messages(self, messages: List[bytearray], output_path: Path) -> bool:
+        """Apply current color mapping to parsed SysEx messages and save to file. Returns False if nothing changed."""
+        off_value = COLOR_MAP['off']
+        changed = False
         
         # Apply colors to each control
-        for control_index, (msg_index, _cc_pos, _ch_pos, color_pos, _flag_pos) in enumerate(CONTROLS):
+        for (msg_index, _cc_pos, _ch_pos, color_pos, _flag_pos), position in _CONTROL_TABLE:
             if msg_index < len(messages) and color_pos < len(messages[msg_index]):
                 # Get color for this control
-                row, col = self._control_index_to_position(control_index)
-                if row is not None and col is not None:
-                    color_name = self.colors.get((row, col), 'off')
-                    color_value = COLOR_MAP.get(color_name, COLOR_MAP['off'])
+                color_name = self.colors.get(position, 'off')
+                color_value = COLOR_MAP.get(color_name, off_value)
+                if messages[msg_index][color_pos] != color_value:
                     messages[msg_index][color_pos] = color_value
+                    changed = True
+        
+        if not changed:
+            logger.debug(f"LED colors unchanged, leaving {output_path} as is")
+            return False
         
-        # Write the modified data back to file
-        combined_data = b"".join(bytes(msg) for msg in messages)
-        output_path.write_bytes(combined_data)
+        # Write the modified messages back to file without concatenating them first
+        with output_path.open('wb') as f:
+            f.writelines(messages)
         logger.debug(f"Applied LED colors to {output_path}")
+        return True
 
     @staticmethod
     def show_menu(prompt: str, options: List[str]) -> int:
@@ -185,16 +208,17 @@ class LEDColorMapper:
             
             try:
                 # Read and extract colors from template
-                template_data = template_path.read_bytes()
-                self._extract_colors_from_sysex(template_data)
+                messages = self._extract_colors_from_sysex(template_path.read_bytes())
                 
                 # Run editor for this template
                 color_map = self.run_interactive_editor()
                 
                 if color_map:
                     # Apply and save changes
-                    self._apply_colors_to_sysex(template_data, template_path)
-                    print(f"LED colors saved for {template_path.name}")
+                    if self._apply_colors_to_messages(messages, template_path):
+                        print(f"LED colors saved for {template_path.name}")
+                    else:
+                        print(f"LED colors unchanged for {template_path.name}, file not modified")
                 else:
                     print(f"LED color editing cancelled for {template_path.name}")
                     # Ask if user wants to continue with remaining templates
@@ -222,155 +246,141 @@ class LEDColorMapper:
         # Setup color pairs - map colors to appropriate terminal colors
         color_pairs = {}
         for i, color_name in enumerate(COLOR_NAMES, 1):
-            if color_name == 'red':
-                curses.init_pair(i, curses.COLOR_RED, -1)
-            elif color_name in ['orange', 'yellow']:
-                curses.init_pair(i, curses.COLOR_YELLOW, -1)
-            elif color_name in ['lime', 'green']:
-                curses.init_pair(i, curses.COLOR_GREEN, -1)
-            elif color_name in ['turquoise', 'cyan']:
-                curses.init_pair(i, curses.COLOR_CYAN, -1)
-            elif color_name == 'light_blue':
-                curses.init_pair(i, curses.COLOR_BLUE, -1)  # Light blue -> blue
-            elif color_name in ['blue', 'dark_blue']:
-                curses.init_pair(i, curses.COLOR_BLUE, -1)
-            elif color_name in ['purple', 'fuchsia']:
-                curses.init_pair(i, curses.COLOR_MAGENTA, -1)
-            elif color_name == 'pink':
-                curses.init_pair(i, curses.COLOR_RED, -1)  # Pink -> red (closest match)
-            elif color_name == 'off':
-                curses.init_pair(i, curses.COLOR_WHITE, -1)
-            else:
-                curses.init_pair(i, curses.COLOR_WHITE, -1)
+            curses.init_pair(i, _COLOR_TO_CURSES.get(color_name, curses.COLOR_WHITE), -1)
             color_pairs[color_name] = i
         
         # Hide cursor
         curses.curs_set(0)
         
+        # Start from a blank screen; after that only changed cells are redrawn
+        self._reset_screen(stdscr)
+        
         while True:
-            stdscr.clear()
             self._draw_interface(stdscr, color_pairs)
-            stdscr.refresh()
+            stdscr.noutrefresh()
+            curses.doupdate()
             
-            key = stdscr.getch()
+            # Wait for a key, then take everything already queued (held keys, pastes)
+            # so a burst of input is applied before a single redraw
+            keys = [stdscr.getch()]
+            stdscr.nodelay(True)
+            try:
+                key = stdscr.getch()
+                while key != -1:
+                    keys.append(key)
+                    key = stdscr.getch()
+            finally:
+                stdscr.nodelay(False)
             
-            if key == ord('q') or key == ord('Q'):
-                break
-            elif key == ord('s') or key == ord('S') or key == ord('\n') or key == ord('\r'):
-                return  # Save and exit
-            elif key == curses.KEY_UP:
-                # Skip slider row (row 3)
-                if self.cursor_row == 4:  # Moving up from buttons to knobs
-                    self.cursor_row = 2  # Skip slider row, go to bottom knobs
-                else:
-                    self.cursor_row = max(0, self.cursor_row - 1)
-            elif key == curses.KEY_DOWN:
-                # Skip slider row (row 3)  
-                if self.cursor_row == 2:  # Moving down from knobs to buttons
-                    self.cursor_row = 4  # Skip slider row, go to top buttons
-                else:
-                    self.cursor_row = min(5, self.cursor_row + 1)
-            elif key == curses.KEY_LEFT:
-                self.cursor_col = max(0, self.cursor_col - 1)
-            elif key == curses.KEY_RIGHT:
-                self.cursor_col = min(7, self.cursor_col + 1)
-            elif key == ord(' ') or key == ord('c') or key == ord('C') or key == ord('\t'):
-                # Cycle color forward
-                self.current_color_idx = (self.current_color_idx + 1) % len(COLOR_NAMES)
-                current_color = COLOR_NAMES[self.current_color_idx]
-                self.colors[(self.cursor_row, self.cursor_col)] = current_color
-            elif key == 353 or key == 351:  # Shift+Tab or Shift+Space (varies by system)
-                # Cycle color backward
-                self.current_color_idx = (self.current_color_idx - 1) % len(COLOR_NAMES)
-                current_color = COLOR_NAMES[self.current_color_idx]
-                self.colors[(self.cursor_row, self.cursor_col)] = current_color
-            elif key == ord('r') or key == ord('R'):
-                # Paint entire row with current control's color
-                current_color = self.colors.get((self.cursor_row, self.cursor_col), 'off')
+            for key in keys:
+                if self._handle_key(stdscr, key):
+                    return
+    
+    def _handle_key(self, stdscr, key: int) -> bool:
+        """Apply a single key press to the editor state. Returns True when the editor should exit."""
+        if key == curses.KEY_RESIZE:
+            # Terminal contents are lost on resize, so repaint everything
+            self._reset_screen(stdscr)
+        elif key == ord('q') or key == ord('Q'):
+            return True
+        elif key == ord('s') or key == ord('S') or key == ord('\n') or key == ord('\r'):
+            return True  # Save and exit
+        elif key == curses.KEY_UP:
+            # Skip slider row (row 3)
+            if self.cursor_row == 4:  # Moving up from buttons to knobs
+                self.cursor_row = 2  # Skip slider row, go to bottom knobs
+            else:
+                self.cursor_row = max(0, self.cursor_row - 1)
+        elif key == curses.KEY_DOWN:
+            # Skip slider row (row 3)  
+            if self.cursor_row == 2:  # Moving down from knobs to buttons
+                self.cursor_row = 4  # Skip slider row, go to top buttons
+            else:
+                self.cursor_row = min(5, self.cursor_row + 1)
+        elif key == curses.KEY_LEFT:
+            self.cursor_col = max(0, self.cursor_col - 1)
+        elif key == curses.KEY_RIGHT:
+            self.cursor_col = min(7, self.cursor_col + 1)
+        elif key == ord(' ') or key == ord('c') or key == ord('C') or key == ord('\t'):
+            # Cycle color forward
+            self.current_color_idx = (self.current_color_idx + 1) % len(COLOR_NAMES)
+            current_color = COLOR_NAMES[self.current_color_idx]
+            self.colors[(self.cursor_row, self.cursor_col)] = current_color
+        elif key == 353 or key == 351:  # Shift+Tab or Shift+Space (varies by system)
+            # Cycle color backward
+            self.current_color_idx = (self.current_color_idx - 1) % len(COLOR_NAMES)
+            current_color = COLOR_NAMES[self.current_color_idx]
+            self.colors[(self.cursor_row, self.cursor_col)] = current_color
+        elif key == ord('r') or key == ord('R'):
+            # Paint entire row with current control's color
+            current_color = self.colors.get((self.cursor_row, self.cursor_col), 'off')
+            for col in range(8):
+                self.colors[(self.cursor_row, col)] = current_color
+        elif key == ord('o') or key == ord('O'):
+            # Paint entire column with current control's color  
+            current_color = self.colors.get((self.cursor_row, self.cursor_col), 'off')
+            for row in range(6):
+                self.colors[(row, self.cursor_col)] = current_color
+        elif key == ord('x') or key == ord('X'):
+            # Turn all controls off
+            for row in range(6):
                 for col in range(8):
-                    self.colors[(self.cursor_row, col)] = current_color
-            elif key == ord('o') or key == ord('O'):
-                # Paint entire column with current control's color  
-                current_color = self.colors.get((self.cursor_row, self.cursor_col), 'off')
-                for row in range(6):
-                    self.colors[(row, self.cursor_col)] = current_color
-            elif key == ord('x') or key == ord('X'):
-                # Turn all controls off
-                for row in range(6):
-                    for col in range(8):
-                        self.colors[(row, col)] = 'off'
+                    self.colors[(row, col)] = 'off'
+        return False
     
-    def _draw_interface(self, stdscr, color_pairs):
-        """Draw the device layout and interface."""
+    def _reset_screen(self, stdscr):
+        """Clear the screen and draw the static frame; all cells are redrawn next frame."""
+        stdscr.clear()
+        self._drawn_cells = {}
+        self._draw_static_frame(stdscr)
+    
+    def _draw_static_frame(self, stdscr):
+        """Draw the border and help text, which never change while the editor runs."""
         stdscr.addstr(0, 0, "┌─ Launch Control XL 3 LED Color Mapper ─────┐")
         
-        # Draw knob rows
-        for i, section_name in enumerate(['knobs_top', 'knobs_mid', 'knobs_bot']):
-            y = i + 2
+        # Side borders of the control rows (knobs, sliders, buttons)
+        for y in range(2, 8):
             stdscr.addstr(y, 0, "│ ")
-            
-            for col in range(8):
-                color_name = self.colors.get((i, col), 'off')
-                color_pair = color_pairs.get(color_name, 0)
-                
-                # Highlight cursor position
-                abbrev = COLOR_ABBREV.get(color_name, color_name[:2].upper())
-                if self.cursor_row == i and self.cursor_col == col:
-                    attr = curses.A_REVERSE | curses.color_pair(color_pair)
-                    display = f"[{abbrev}]"
-                else:
-                    attr = curses.color_pair(color_pair)
-                    display = f" {abbrev} "
-                
-                stdscr.addstr(y, 2 + col * 5, display, attr)
-            
             stdscr.addstr(y, 44, " │")
         
-        # Draw sliders
-        y = 5
-        stdscr.addstr(y, 0, "│ ")
-        for col in range(8):
-            color_name = self.colors.get((3, col), 'off')
-            color_pair = color_pairs.get(color_name, 0)
-            
-            if self.cursor_row == 3 and self.cursor_col == col:
-                attr = curses.A_REVERSE | curses.color_pair(color_pair)
-                display = "[██]"
-            else:
-                attr = curses.color_pair(color_pair)
-                display = " ██ "
-            
+        # Draw controls
+        stdscr.addstr(8, 0, "│                                           │")
+        stdscr.addstr(9, 0, "│ Navigate: ↑↓←→  Cycle: SPACE/TAB/C       │")
+        stdscr.addstr(10, 0, "│ Row: R  Column: O  All Off: X             │")
+        stdscr.addstr(11, 0, "│ Save: S/Enter  Quit: Q                    │")
+        stdscr.addstr(13, 0, "└───────────────────────────────────────────┘")
+    
+    def _draw_cell(self, stdscr, row: int, col: int, y: int, display: str, attr: int):
+        """Draw a control cell unless it already shows the same content."""
+        cell = (display, attr)
+        if self._drawn_cells.get((row, col)) != cell:
             stdscr.addstr(y, 2 + col * 5, display, attr)
-        stdscr.addstr(y, 44, " │")
-        
-        # Draw button rows
-        for i, section_name in enumerate(['buttons_top', 'buttons_bot']):
-            y = i + 6
-            stdscr.addstr(y, 0, "│ ")
-            
+            self._drawn_cells[(row, col)] = cell
+    
+    def _draw_interface(self, stdscr, color_pairs):
+        """Draw the control cells and current selection on top of the static frame."""
+        for row, y, is_slider in _ROW_LAYOUT:
+            cursor_col = self.cursor_col if self.cursor_row == row else -1
             for col in range(8):
-                color_name = self.colors.get((i + 4, col), 'off')
+                color_name = self.colors.get((row, col), 'off')
                 color_pair = color_pairs.get(color_name, 0)
                 
-                abbrev = COLOR_ABBREV.get(color_name, color_name[:2].upper())
-                if self.cursor_row == i + 4 and self.cursor_col == col:
+                # Highlight cursor position
+                if col == cursor_col:
                     attr = curses.A_REVERSE | curses.color_pair(color_pair)
-                    display = f"[{abbrev}]"
+                    if is_slider:
+                        display = _SLIDER_CURSOR
+                    else:
+                        display = _CELL_CURSOR.get(color_name) or f"[{_cell_abbrev(color_name)}]"
                 else:
                     attr = curses.color_pair(color_pair)
-                    display = f" {abbrev} "
+                    if is_slider:
+                        display = _SLIDER_NORMAL
+                    else:
+                        display = _CELL_NORMAL.get(color_name) or f" {_cell_abbrev(color_name)} "
                 
-                stdscr.addstr(y, 2 + col * 5, display, attr)
-            
-            stdscr.addstr(y, 44, " │")
-        
-        # Draw controls
-        stdscr.addstr(8, 0, "│                                           │")
-        stdscr.addstr(9, 0, "│ Navigate: ↑↓←→  Cycle: SPACE/TAB/C       │")
-        stdscr.addstr(10, 0, "│ Row: R  Column: O  All Off: X             │")
-        stdscr.addstr(11, 0, "│ Save: S/Enter  Quit: Q                    │")
+                self._draw_cell(stdscr, row, col, y, display, attr)
         
         # Current selection info
         current_color = self.colors.get((self.cursor_row, self.cursor_col), 'off')
-        stdscr.addstr(12, 0, f"│ Current: Row {self.cursor_row+1}, Col {self.cursor_col+1} ({current_color})".ljust(43) + " │")
-        stdscr.addstr(13, 0, "└───────────────────────────────────────────┘")
\ No newline at end of file
+        stdscr.addstr(12, 0, f"│ Current: Row {self.cursor_row+1}, Col {self.cursor_col+1} ({current_color})".ljust(43) + " │")
\ No newline at end of file
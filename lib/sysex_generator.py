@@ -1,18 +1,72 @@
 """SysEx template generator for Launch Control XL 3."""
 
 import logging
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from enum import Enum
 
 from .constants import (
-    EMBEDDED_MSGS, CONTROLS, MAX_CC_VALUE, MIN_CC_VALUE, 
+    EMBEDDED_MSGS, BASE_FLAT, CONTROLS, CC_OFFSETS, CH_OFFSETS, FLAG_OFFSETS, MESSAGE_OFFSETS, MAX_CC_VALUE, MIN_CC_VALUE, 
     MAX_MIDI_CHANNEL, MIN_MIDI_CHANNEL, DEFAULT_TEMPLATE_COUNT, DEFAULT_MIN_CC_VALUE,
     SAFE_CC_MIN, SAFE_CC_MAX
 )
 
 logger = logging.getLogger(__name__)
 
+# Raw file flags for template output; O_BINARY keeps Windows from translating 0x0A bytes.
+# New files are created exclusively so overwrites are detected without a separate stat.
+_CREATE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+_OVERWRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _offset_runs(offsets: Sequence[int]) -> List[Tuple[slice, int, int]]:
+    """
+    Group offsets into constant-stride runs for extended-slice assignment.
+    
+    Args:
+        offsets: Absolute buffer offsets, one per control
+        
+    Returns:
+        List of (buffer slice, first control index, end control index) tuples
+    """
+    runs = []
+    start = 0
+    while start < len(offsets):
+        end = start + 1
+        step = offsets[end] - offsets[start] if end < len(offsets) else 1
+        if step == 0:
+            step = 1  # Repeated offset can't share a slice; start a new run
+        while end < len(offsets) and offsets[end] - offsets[end - 1] == step:
+            end += 1
+        if end - start == 1:
+            step = 1
+        # Stop one step past the last offset; a descending run that ends at 0 has no stop
+        stop = offsets[end - 1] + (1 if step > 0 else -1)
+        runs.append((slice(offsets[start], stop if stop >= 0 else None, step), start, end))
+        start = end
+    return runs
+
+
+# Controls are laid out at a fixed stride, so each field is written with a few slice scatters
+_CC_RUNS = _offset_runs(CC_OFFSETS)
+_CH_RUNS = _offset_runs(CH_OFFSETS)
+_FLAG_RUNS = _offset_runs(FLAG_OFFSETS)
+_FLAG_VALUES = bytes(len(FLAG_OFFSETS))  # Local channel mode (0x00) for every flag
+
+# Channel bytes for every channel run, indexed by zero-based channel
+_CHANNEL_FILLS = [
+    [bytes((channel,)) * (end - start) for _, start, end in _CH_RUNS]
+    for channel in range(MAX_MIDI_CHANNEL)
+]
+
+# Location of each embedded message within the concatenated buffer
+_MESSAGE_SLICES = [slice(offset, offset + len(msg)) for offset, msg in zip(MESSAGE_OFFSETS, EMBEDDED_MSGS)]
+
+# Every safe CC in forward and reverse assignment order
+_SAFE_CCS_FORWARD = bytes(range(SAFE_CC_MIN, SAFE_CC_MAX + 1))
+_SAFE_CCS_REVERSE = _SAFE_CCS_FORWARD[::-1]
+
 
 class ChannelMode(Enum):
     """Channel assignment modes."""
@@ -26,9 +80,51 @@ class CCMode(Enum):
     CONTINUOUS = "continuous"           # CCs 1-127 continuous across templates
 
 
+def _specialize_base(cc_values: bytes) -> bytes:
+    """
+    Bake a CC assignment into the base messages.
+    
+    Everything except the channel bytes is fixed for a given CC assignment,
+    so templates sharing one only differ in their channel.
+    
+    Args:
+        cc_values: One CC value per control, in CONTROLS order
+        
+    Returns:
+        Concatenated base messages with CCs and local channel flags applied
+    """
+    buf = bytearray(BASE_FLAT)
+    # Set local channel mode on controls that have a flag position
+    for run, start, end in _FLAG_RUNS:
+        buf[run] = _FLAG_VALUES[start:end]
+    for run, start, end in _CC_RUNS:
+        buf[run] = cc_values[start:end]
+    return bytes(buf)
+
+
+def _generate_into(buf: bytearray, base: bytes, zero_based_channel: int) -> None:
+    """
+    Fill buf with a specialized base and write the template's channel.
+    
+    This is the whole per-template hot path; callers resolve the channel and
+    specialized base beforehand so nothing here branches on modes.
+    
+    Args:
+        buf: Concatenated message buffer to fill
+        base: Base messages specialized by _specialize_base
+        zero_based_channel: MIDI channel (0-15)
+    """
+    buf[:] = base
+    for (run, _, _), ch_values in zip(_CH_RUNS, _CHANNEL_FILLS[zero_based_channel]):
+        buf[run] = ch_values
+
+
 class SysExTemplateGenerator:
     def __init__(self):
-        self.base_messages = [bytearray(msg) for msg in EMBEDDED_MSGS]
+        # Single reusable buffer holding all messages back-to-back
+        self._scratch = bytearray(len(BASE_FLAT))
+        # Specialized base messages keyed by (first_offset, safe_min_cc, cc_reverse)
+        self._base_cache: Dict[Tuple[int, int, bool], bytes] = {}
     
     def _validate_channel(self, channel_1_16: int) -> int:
         """
@@ -64,103 +160,104 @@ class SysExTemplateGenerator:
             raise ValueError(f"Template count must be integer between 1-15, got: {count}")
         return count
     
-    def _clone_messages(self) -> List[bytearray]:
-        """Create a deep copy of base messages for modification."""
-        return [bytearray(msg) for msg in self.base_messages]
+    def _get_cc_values(self, first_offset: int, safe_min_cc: int, cc_reverse: bool) -> bytes:
+        """
+        Compute the CC number of every control for a template.
+        
+        Args:
+            first_offset: Index into the safe CC sequence of the first control's CC
+            safe_min_cc: Starting CC number, already clamped to the safe range
+            cc_reverse: Start at 127 and assign backwards
+            
+        Returns:
+            One CC value per control, in CONTROLS order
+        """
+        # Usable CCs in assignment order; controls past the end are disabled (CC 0)
+        available_ccs = max(SAFE_CC_MAX - safe_min_cc + 1, 0)
+        if cc_reverse:
+            # Start at SAFE_CC_MAX and go backwards
+            safe_ccs = _SAFE_CCS_REVERSE[:available_ccs]
+        else:
+            safe_ccs = _SAFE_CCS_FORWARD[len(_SAFE_CCS_FORWARD) - available_ccs:]
+        return safe_ccs[first_offset:first_offset + len(CONTROLS)].ljust(len(CONTROLS), b"\x00")
     
-    def _assign_continuous_controllers(
-        self, 
-        messages: List[bytearray], 
-        template_index: int = 0,
-        cc_mode: CCMode = CCMode.RESTART_PER_TEMPLATE,
-        min_cc_value: int = DEFAULT_MIN_CC_VALUE,
-        cc_reverse: bool = False
-    ) -> None:
+    def _get_template_base(
+        self,
+        template_index: int,
+        cc_mode: CCMode,
+        min_cc_value: int,
+        cc_reverse: bool
+    ) -> bytes:
         """
-        Assign CC values based on the specified mode.
+        Get the base messages specialized for a template's CC assignment.
+        
+        Results are cached, so restart mode builds one base per configuration.
         
         Args:
-            messages: List of message bytearrays to modify
             template_index: Zero-based template index (for continuous mode)
             cc_mode: CC numbering strategy
             min_cc_value: Starting CC number
             cc_reverse: Start at 127 and assign backwards
+            
+        Returns:
+            Concatenated base messages with CCs and local channel flags applied
         """
         # Ensure min_cc_value is within safe range
         safe_min_cc = max(min_cc_value, SAFE_CC_MIN)
-        available_ccs = SAFE_CC_MAX - safe_min_cc + 1  # Total available CC range within safe limits
-        
-        for control_index, (msg_index, cc_pos, _ch_pos, _col_pos, _flag_pos) in enumerate(CONTROLS):
-            # Calculate which CC number this control should get
-            if cc_mode == CCMode.RESTART_PER_TEMPLATE:
-                cc_offset = control_index
-            else:  # CCMode.CONTINUOUS
-                cc_offset = (template_index * len(CONTROLS)) + control_index
-            
-            # Check if we've exhausted available CC numbers within safe range
-            if cc_offset >= available_ccs:
-                # Disable this control - set CC to 0 (typically means disabled/unused)
-                cc_value = 0
-            else:
-                if cc_reverse:
-                    # Start at SAFE_CC_MAX and go backwards
-                    cc_value = SAFE_CC_MAX - cc_offset
-                    # Ensure we don't go below safe minimum
-                    if cc_value < SAFE_CC_MIN:
-                        cc_value = 0  # Disable if outside safe range
-                else:
-                    # Normal forward assignment within safe range
-                    cc_value = safe_min_cc + cc_offset
-                    # Ensure we don't exceed safe maximum
-                    if cc_value > SAFE_CC_MAX:
-                        cc_value = 0  # Disable if outside safe range
-            
-            messages[msg_index][cc_pos] = cc_value
-    
-    def _set_midi_channel(self, messages: List[bytearray], channel_1_16: int) -> None:
-        """
-        Set MIDI channel for all controls in the template.
         
-        Args:
-            messages: List of message bytearrays to modify
-            channel_1_16: MIDI channel (1-16)
-        """
-        zero_based_channel = self._validate_channel(channel_1_16)
+        # Calculate which CC number the first control should get
+        if cc_mode is CCMode.RESTART_PER_TEMPLATE:
+            first_offset = 0
+        else:  # CCMode.CONTINUOUS
+            # Templates starting past the safe range all get the same disabled controls
+            available_ccs = max(SAFE_CC_MAX - safe_min_cc + 1, 0)
+            first_offset = min(template_index * len(CONTROLS), available_ccs)
         
-        for (msg_index, _cc_pos, ch_pos, _col_pos, flag_pos) in CONTROLS:
-            messages[msg_index][ch_pos] = zero_based_channel
-            if flag_pos >= 0:  # Set local channel mode if flag position exists
-                messages[msg_index][flag_pos] = 0x00
+        key = (first_offset, safe_min_cc, cc_reverse)
+        base = self._base_cache.get(key)
+        if base is None:
+            base = _specialize_base(self._get_cc_values(first_offset, safe_min_cc, cc_reverse))
+            self._base_cache[key] = base
+        return base
     
-    def _set_button_modes(self, messages: List[bytearray]) -> None:
+    def _set_button_modes(self, buf: bytearray) -> None:
         """
         Set button modes - defaults bottom two button rows (32-47) to toggle mode.
         The button controls already have 0x50 in the embedded messages, so we don't need to modify them.
         This method is kept for future enhancements if needed.
         
         Args:
-            messages: List of message bytearrays to modify
+            buf: Concatenated message buffer to modify
         """
         # The embedded SysEx messages already have the correct button mode (0x50) 
         # for the button controls (32-47) in message 1.
         # No modification needed - the buttons are already configured correctly.
         pass
     
-    def _write_sysex_file(self, file_path: Path, messages: List[bytearray]) -> None:
+    def _write_sysex_file(self, file_path: Path, data: bytes) -> None:
         """
-        Write SysEx messages to file with error handling.
+        Write SysEx messages to file with error handling, warning on overwrite.
         
         Args:
             file_path: Output file path
-            messages: List of message bytearrays to write
+            data: Concatenated message buffer to write
             
         Raises:
             IOError: If file cannot be written
         """
         try:
-            combined_data = b"".join(bytes(msg) for msg in messages)
-            file_path.write_bytes(combined_data)
-            logger.debug(f"Successfully wrote {len(combined_data)} bytes to {file_path}")
+            try:
+                fd = os.open(file_path, _CREATE_FLAGS, 0o666)
+            except FileExistsError:
+                logger.warning("Overwriting existing file: %s", file_path)
+                fd = os.open(file_path, _OVERWRITE_FLAGS, 0o666)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+            logger.debug("Successfully wrote %d bytes to %s", len(data), file_path)
         except (OSError, IOError) as e:
             raise IOError(f"Failed to write file {file_path}: {e}")
     
@@ -181,7 +278,7 @@ class SysExTemplateGenerator:
         Returns:
             MIDI channel (1-16)
         """
-        if channel_mode == ChannelMode.GLOBAL:
+        if channel_mode is ChannelMode.GLOBAL:
             if global_channel is None:
                 raise ValueError("Global channel must be specified for GLOBAL channel mode")
             return global_channel
@@ -189,6 +286,38 @@ class SysExTemplateGenerator:
             # Cap at channel 16 if template number exceeds 16
             return min(template_num, MAX_MIDI_CHANNEL)
     
+    def _render_template(
+        self,
+        buf: bytearray,
+        template_index: int,
+        zero_based_channel: int,
+        cc_mode: CCMode,
+        min_cc_value: int,
+        cc_reverse: bool
+    ) -> bytearray:
+        """
+        Render a template into a scratch buffer without revalidating inputs.
+        
+        Args:
+            buf: Scratch buffer to render into (overwritten entirely)
+            template_index: Zero-based template index (for continuous mode)
+            zero_based_channel: Validated MIDI channel (0-15)
+            cc_mode: CC numbering strategy
+            min_cc_value: Starting CC number
+            cc_reverse: Start at 127 and assign backwards
+            
+        Returns:
+            The scratch buffer holding the configured messages back-to-back
+        """
+        base = self._get_template_base(template_index, cc_mode, min_cc_value, cc_reverse)
+        
+        _generate_into(buf, base, zero_based_channel)
+        
+        # Set button modes (bottom two rows default to toggle)
+        self._set_button_modes(buf)
+        
+        return buf
+    
     def generate_template(
         self, 
         template_num: int,
@@ -212,20 +341,16 @@ class SysExTemplateGenerator:
         Returns:
             List of configured message bytearrays
         """
-        messages = self._clone_messages()
-        
-        # Determine channel
         channel = self._get_channel_for_template(template_num, channel_mode, global_channel)
-        self._set_midi_channel(messages, channel)
+        zero_based_channel = self._validate_channel(channel)
         
-        # Set button modes (bottom two rows default to toggle)
-        self._set_button_modes(messages)
-        
-        # Assign CCs
         template_index = template_num - 1  # Convert to 0-based for CC calculation
-        self._assign_continuous_controllers(messages, template_index, cc_mode, min_cc_value, cc_reverse)
+        buf = self._render_template(
+            self._scratch, template_index, zero_based_channel, cc_mode, min_cc_value, cc_reverse
+        )
         
-        return messages
+        # Slicing copies, so the returned messages are independent of the scratch buffer
+        return [buf[message] for message in _MESSAGE_SLICES]
     
     def generate_all_templates(
         self,
@@ -270,37 +395,44 @@ class SysExTemplateGenerator:
         
         generated_files = []
         
+        # Resolve and validate every template's channel once, outside the render loop
+        channels = [
+            self._validate_channel(self._get_channel_for_template(template_num, channel_mode, global_channel))
+            for template_num in range(1, template_count + 1)
+        ]
+        
+        # In restart mode a template depends only on its channel, so when every template
+        # shares one channel (global mode) the first render is written for all of them
+        render_once = cc_mode is CCMode.RESTART_PER_TEMPLATE and len(set(channels)) == 1
+        data = None
+        
         logger.info(f"Generating {template_count} templates:")
         logger.info(f"  Channel Mode: {channel_mode.value}")
         logger.info(f"  CC Mode: {cc_mode.value}")
-        if channel_mode == ChannelMode.GLOBAL and global_channel:
+        if channel_mode is ChannelMode.GLOBAL and global_channel:
             logger.info(f"  Global Channel: {global_channel}")
         
-        for template_num in range(1, template_count + 1):
+        # Build every output path up front so the loop only renders and writes
+        output_files = [
+            output_dir / f"{output_prefix}_T{template_num:02d}.syx"
+            for template_num in range(1, template_count + 1)
+        ]
+        
+        for template_index, (zero_based_channel, output_file) in enumerate(zip(channels, output_files)):
+            template_num = template_index + 1
             try:
-                messages = self.generate_template(
-                    template_num=template_num,
-                    channel_mode=channel_mode,
-                    cc_mode=cc_mode,
-                    global_channel=global_channel,
-                    min_cc_value=min_cc_value,
-                    cc_reverse=cc_reverse
-                )
-                
-                output_file = output_dir / f"{output_prefix}_T{template_num:02d}.syx"
-                
-                # Check if file exists and warn user
-                if output_file.exists():
-                    logger.warning(f"Overwriting existing file: {output_file}")
+                if data is None or not render_once:
+                    data = self._render_template(
+                        self._scratch, template_index, zero_based_channel, cc_mode, min_cc_value, cc_reverse
+                    )
                 
-                self._write_sysex_file(output_file, messages)
+                self._write_sysex_file(output_file, data)
                 generated_files.append(output_file)
                 
-                # Log channel and CC info for first few templates
-                if template_num <= 3 or logger.level <= logging.DEBUG:
-                    channel = self._get_channel_for_template(template_num, channel_mode, global_channel)
-                    first_cc = ((template_num - 1) * len(CONTROLS) if cc_mode == CCMode.CONTINUOUS else 0) + 1
-                    logger.debug(f"  T{template_num:02d}: Channel {channel}, CCs start at {first_cc}")
+                # Log channel and CC info per template
+                if logger.isEnabledFor(logging.DEBUG):
+                    first_cc = (template_index * len(CONTROLS) if cc_mode is CCMode.CONTINUOUS else 0) + 1
+                    logger.debug("  T%02d: Channel %d, CCs start at %d", template_num, zero_based_channel + 1, first_cc)
                 
             except Exception as e:
                 logger.error(f"Failed to generate template {template_num}: {e}")